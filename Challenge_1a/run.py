@@ -1,22 +1,45 @@
 import os
 import sys
+
+# The shared common/ package lives at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from process import extract_outline, save_outline
+from common.scheduler import run_batch, print_report
 
 INPUT_DIR = "input"
 OUTPUT_DIR = "output"
+WORKERS = int(os.environ.get("WORKERS", os.cpu_count() or 1))
+PAGE_COST_HISTORY = os.environ.get("PAGE_COST_HISTORY")
+
+
+def outline_job(pdf_path, pages):
+    # Outlines need the whole document (title, TOC), so 1a never splits files
+    return extract_outline(pdf_path)
+
+
+if __name__ == "__main__":
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    pdf_files = [f for f in os.listdir(INPUT_DIR) if f.lower().endswith(".pdf")]
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if not pdf_files:
+        print("❌ No PDF files found in input folder.")
+        sys.exit(1)
 
-pdf_files = [f for f in os.listdir(INPUT_DIR) if f.lower().endswith(".pdf")]
+    pdf_paths = [os.path.join(INPUT_DIR, pdf) for pdf in pdf_files]
+    print(f"📄 Processing {len(pdf_paths)} PDFs (largest first)")
 
-if not pdf_files:
-    print("❌ No PDF files found in input folder.")
-    sys.exit(1)
+    def save_result(slot, result, error):
+        # Saved as each file finishes, so one bad PDF cannot discard the rest
+        if not error:
+            save_outline(pdf_paths[slot], result)
 
-for pdf in pdf_files:
-    pdf_path = os.path.join(INPUT_DIR, pdf)
-    print(f"📄 Processing: {pdf}")
-    result = extract_outline(pdf_path)
-    save_outline(pdf_path, result)
+    results, report = run_batch(
+        pdf_paths, outline_job, workers=WORKERS, history_file=PAGE_COST_HISTORY, on_result=save_result
+    )
 
-print("✅ All PDFs processed.")
+    print_report(report)
+    if report["failed"]:
+        print(f"⚠️  {len(report['failed'])} of {len(pdf_paths)} PDFs failed.")
+        sys.exit(1)
+    print("✅ All PDFs processed.")
@@ -1,18 +1,40 @@
 import os
+import sys
 import json
-import fitz  # PyMuPDF
 import re
+import heapq
+import itertools
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+import multiprocessing
 from datetime import datetime
 import time
 from collections import Counter
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.layout import analyze_document, optimal_ocr_clean, shared_analysis
+from common.scheduler import run_batch, print_report, plan_batch, load_page_costs, save_page_costs
+from common.cache import ResultCache, corpus_version, make_key, normalize_text
+
 INPUT_DIR = "input"
 PERSONA_FILE = "persona.json"
 OUTPUT_DIR = "output"
 OUTPUT_FILE = "result.json"
+WORKERS = int(os.environ.get("WORKERS", os.cpu_count() or 1))
+PAGE_COST_HISTORY = os.environ.get("PAGE_COST_HISTORY")
+RANK_SHARDS = int(os.environ.get("RANK_SHARDS", 1))
+TFIDF_MAX_FEATURES = 2000
+# Bump whenever extraction, ranking or output format changes so cached results are not reused
+RESULT_SCHEMA_VERSION = 2
+
+# Repeated persona/job queries against an unchanged corpus are served from here
+RESULT_CACHE = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_SIZE", 128)),
+    ttl=float(os.environ.get("RESULT_CACHE_TTL", 24 * 3600)),
+    disk_dir=os.environ.get("RESULT_CACHE_DIR")
+)
 
 # Load persona and job
 try:
@@ -29,64 +51,8 @@ except Exception as e:
     persona_job_text = f"{persona}. {job}"
     documents = []
 
-# Pre-compiled OCR fixes for maximum speed and accuracy
-OCR_FIXES = {
-    # Exact matches from actual errors
-    'savethe': 'save the', 'fromthe': 'from the', 'hamburgermenu': 'hamburger menu',
-    'renamethefile': 'rename the file', 'changeaflat': 'change a flat', 'formtoa': 'form to a',
-    'usingthe': 'using the', 'enablingthe': 'enabling the', 'FillinPDF': 'Fill in PDF',
-    'Istheform': 'Is the form', 'doesnotin': 'does not in', 'availablefrom': 'available from',
-    'Fromthetop': 'From the top', 'Createa': 'Create a', 'andthen': 'and then',
-    'selectthefile': 'select the file', 'tothe': 'to the', 'inthe': 'in the',
-    'ofthe': 'of the', 'onthe': 'on the', 'forthe': 'for the', 'withthe': 'with the',
-    'youcan': 'you can', 'itcan': 'it can', 'SaveAs': 'Save As', 'SaveAsin': 'Save As in',
-    'AdobeIn': 'Adobe In', 'AdobePDF': 'Adobe PDF', 'Fill&Sign': 'Fill & Sign',
-    'FillSign': 'Fill & Sign', 'PDFMaker': 'PDF Maker', 'PrepareForm': 'Prepare Form',
-    'SaveACopy': 'Save A Copy', 'thefile': 'the file', 'theform': 'the form',
-    'thetool': 'the tool', 'thefield': 'the field', 'thebutton': 'the button',
-    'youhave': 'you have', 'youare': 'you are', 'youwill': 'you will', 'youwant': 'you want',
-    'itis': 'it is', 'itwill': 'it will', 'ithas': 'it has', 'itdoes': 'it does',
-    'tosave': 'to save', 'tocreate': 'to create', 'tochange': 'to change', 'tofill': 'to fill',
-    'forsave': 'for save', 'forcreate': 'for create', 'witha': 'with a', 'withan': 'with an',
-    'asa': 'as a', 'asan': 'as an', 'ora': 'or a', 'oran': 'or an',
-    
-    # Contractions
-    'dont': "don't", 'cant': "can't", 'wont': "won't", 'doesnt': "doesn't",
-    'isnt': "isn't", 'arent': "aren't", 'wasnt': "wasn't", 'werent': "weren't",
-    'hasnt': "hasn't", 'havent': "haven't", 'wouldnt': "wouldn't", 'shouldnt': "shouldn't",
-    'couldnt': "couldn't", 'mustnt': "mustn't", 'mightnt': "mightn't",
-    
-    # Product names
-    'AdobeAcrobat': 'Adobe Acrobat', 'AdobeReader': 'Adobe Reader', 'MicrosoftOffice': 'Microsoft Office',
-    'MicrosoftWord': 'Microsoft Word', 'AdobePhotoshop': 'Adobe Photoshop',
-    'AdobeIllustrator': 'Adobe Illustrator', 'AdobeInDesign': 'Adobe InDesign',
-}
-
 # Pre-compiled regex patterns for speed
-SPACE_PATTERN = re.compile(r'\s+')
 SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
-ACRONYM_PATTERN = re.compile(r'\b([A-Z])\s+([A-Z])\s+([A-Z])\b')
-
-def optimal_ocr_clean(text):
-    """Optimal OCR cleaning - fast and comprehensive"""
-    if not text:
-        return ""
-    
-    # Normalize whitespace first
-    text = SPACE_PATTERN.sub(' ', text).strip()
-    
-    # Apply exact fixes (fastest method)
-    for bad, good in OCR_FIXES.items():
-        if bad in text:
-            text = text.replace(bad, good)
-    
-    # Fix spaced acronyms
-    text = ACRONYM_PATTERN.sub(r'\1\2\3', text)
-    
-    # Fix common spacing patterns (minimal regex for speed)
-    text = re.sub(r'\b([a-z]+)([A-Z][a-z]+)\b', r'\1 \2', text)  # wordWord -> word Word
-    
-    return text.strip()
 
 def smart_keyword_extraction(persona, job, documents):
     """Smart keyword extraction optimized for relevance"""
@@ -128,192 +94,27 @@ def smart_keyword_extraction(persona, job, documents):
     
     return [kw for kw in keywords if kw not in stop_words and len(kw) > 2]
 
-def extract_premium_sections(pdf_path):
+def extract_premium_sections(pdf_path, pages=None):
     """Extract sections with optimal balance of speed and accuracy"""
-    try:
-        doc = fitz.open(pdf_path)
-    except:
-        return []
-    
-    sections = []
     filename = os.path.basename(pdf_path)
-    
+
     # Skip irrelevant files early
     if any(skip in filename.lower() for skip in ['test', 'ultimate', 'checklist', 'skills']):
-        doc.close()
-        return sections
-    
-    for page_num in range(len(doc)):
-        try:
-            page = doc[page_num]
-            text = page.get_text()
-            
-            if not text or len(text) < 100:
-                continue
-            
-            # Clean text once
-            clean_text = optimal_ocr_clean(text)
-            
-            # Try font-based extraction first (most accurate)
-            font_sections = extract_by_font_analysis(page, page_num + 1, filename, clean_text)
-            if font_sections:
-                sections.extend(font_sections)
-                continue
-            
-            # Fallback to pattern-based extraction
-            pattern_sections = extract_by_patterns(clean_text, page_num + 1, filename)
-            sections.extend(pattern_sections)
-            
-        except Exception as e:
-            continue
-    
-    doc.close()
-    return sections
+        return []
 
-def extract_by_font_analysis(page, page_num, filename, clean_text):
-    """Font-based extraction for structured documents"""
-    sections = []
-    
     try:
-        blocks = page.get_text("dict")["blocks"]
-        text_elements = []
-        
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        if span["text"].strip():
-                            text_elements.append({
-                                'text': optimal_ocr_clean(span["text"].strip()),
-                                'size': span["size"],
-                                'flags': span["flags"]
-                            })
-        
-        if not text_elements:
-            return sections
-        
-        # Find headers by font size
-        sizes = [elem['size'] for elem in text_elements]
-        avg_size = np.mean(sizes)
-        threshold = avg_size * 1.1
-        
-        current_title = None
-        current_content = []
-        
-        for elem in text_elements:
-            text = elem['text']
-            is_header = (
-                (elem['size'] > threshold or elem['flags'] & 16) and  # Larger or bold
-                is_quality_title(text)
-            )
-            
-            if is_header:
-                # Save previous section
-                if current_title and current_content:
-                    content = ' '.join(current_content)
-                    if len(content) > 80:
-                        sections.append({
-                            "document": filename,
-                            "page": page_num,
-                            "section_title": current_title,
-                            "section_content": content
-                        })
-                current_title = text
-                current_content = []
-            else:
-                current_content.append(text)
-        
-        # Add final section
-        if current_title and current_content:
-            content = ' '.join(current_content)
-            if len(content) > 80:
-                sections.append({
-                    "document": filename,
-                    "page": page_num,
-                    "section_title": current_title,
-                    "section_content": content
-                })
-    
-    except:
-        pass
+        # Reuse 1A's layout of this file when LAYOUT_CACHE_DIR is shared
+        analysis = shared_analysis(pdf_path, pages)
+    except Exception:
+        # The full analysis fails on a broken page; sections alone can skip it
+        analysis = None
     
-    return sections
-
-def extract_by_patterns(text, page_num, filename):
-    """Pattern-based extraction as fallback"""
-    sections = []
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
-    current_title = None
-    current_content = []
-    
-    for line in lines:
-        if is_quality_title(line):
-            # Save previous section
-            if current_title and current_content:
-                content = ' '.join(current_content)
-                if len(content) > 80:
-                    sections.append({
-                        "document": filename,
-                        "page": page_num,
-                        "section_title": current_title,
-                        "section_content": content
-                    })
-            current_title = line
-            current_content = []
-        else:
-            current_content.append(line)
-    
-    # Add final section
-    if current_title and current_content:
-        content = ' '.join(current_content)
-        if len(content) > 80:
-            sections.append({
-                "document": filename,
-                "page": page_num,
-                "section_title": current_title,
-                "section_content": content
-            })
-    
-    return sections
-
-def is_quality_title(text):
-    """Determine if text is a high-quality section title"""
-    if not text or len(text) < 5 or len(text) > 120:
-        return False
-    
-    words = text.split()
-    if len(words) > 15:
-        return False
-    
-    # Reject obvious content patterns
-    reject_patterns = [
-        'to save the completed', 'choose save as from', 'and rename the file',
-        'you can change a', 'by either using', 'for microsoft office',
-        'from the top toolbar', 'select create a pdf'
-    ]
-    
-    if any(pattern in text.lower() for pattern in reject_patterns):
-        return False
-    
-    # Prefer questions
-    if text.endswith('?'):
-        return True
-    
-    # Prefer action-based titles
-    action_words = ['create', 'change', 'fill', 'sign', 'convert', 'edit', 'save', 'export', 'request', 'send']
-    if any(word in text.lower() for word in action_words):
-        return True
-    
-    # Prefer title case without ending period
-    if text.istitle() and not text.endswith('.'):
-        return True
-    
-    # Reject fragments ending with prepositions
-    if text.lower().endswith((' the', ' a', ' an', ' and', ' or', ' of', ' in', ' on', ' at', ' to', ' for')):
-        return False
-    
-    return True
+    try:
+        if analysis is None:
+            analysis = analyze_document(pdf_path, outline=False, pages=pages)
+        return analysis["sections"]
+    except Exception:
+        return []
 
 def calculate_optimal_score(section, query, keywords):
     """Optimal scoring algorithm for maximum accuracy"""
@@ -377,7 +178,7 @@ def rank_sections_optimally(sections, query, keywords):
     # Enhance with TF-IDF for final ranking
     try:
         texts = [f"{s['section_title']} {s['section_content']}" for s in candidates]
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=2000, ngram_range=(1, 2))
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=TFIDF_MAX_FEATURES, ngram_range=(1, 2))
         tfidf_matrix = vectorizer.fit_transform(texts)
         query_vec = vectorizer.transform([query])
         tfidf_scores = cosine_similarity(query_vec, tfidf_matrix)[0]
@@ -390,10 +191,227 @@ def rank_sections_optimally(sections, query, keywords):
         for section in candidates:
             section["final_score"] = section["relevance_score"]
     
-    # Sort and return top sections
-    ranked = sorted(candidates, key=lambda x: -x["final_score"])[:10]
+    # Keep the top sections without sorting the whole candidate list
+    ranked = heapq.nsmallest(10, candidates, key=lambda x: -x["final_score"])
+    return ranked
+
+def rank_sections_sharded(sections, query, keywords, shards=2, workers=None, top_k=10):
+    """Map-reduce version of rank_sections_optimally across worker processes.
+
+    Each worker owns one shard for both map phases and only sends back compact
+    term statistics and its local top-k. IDF is computed once over all candidates
+    so every shard scores with the same weights, and the top-k lists are heap-merged.
+    At most `workers` (default: CPU count) processes are started.
+    """
+    if not sections:
+        return []
+    
+    shards = max(1, min(shards, workers or os.cpu_count() or 1, len(sections)))
+    size = -(-len(sections) // shards)
+    indexed = list(enumerate(sections))
+    payloads = [("sections", indexed[i:i + size]) for i in range(0, len(indexed), size)]
+    ranked, _, _ = _run_shards(payloads, query, keywords, top_k)
     return ranked
 
+def rank_documents_sharded(pdf_paths, query, keywords, shards=2, workers=None, top_k=10, history_file=None):
+    """Like rank_sections_sharded, but every worker extracts its own PDFs.
+
+    Files are planned as in run_batch(): largest-first by page count and recorded
+    per-page cost, with files bigger than one shard's share split into page ranges,
+    and each LPT bin becomes a shard. The section list never exists in this process.
+    Returns the ranked sections, a {slot: section count} map for the files in
+    `pdf_paths` and a print_report() report; timings are saved to `history_file`.
+    """
+    if not pdf_paths:
+        return [], {}, None
+    
+    shards = max(1, min(shards, workers or os.cpu_count() or 1))
+    page_costs = load_page_costs(history_file)
+    jobs = plan_batch(pdf_paths, shards, page_costs, split=True)
+    parts = Counter(job["slot"] for job in jobs)
+    payloads = []
+    for worker in range(shards):
+        shard_jobs = sorted(
+            (job["slot"], job["part"], job["path"], job["pages"] if parts[job["slot"]] > 1 else None)
+            for job in jobs if job["worker"] == worker
+        )
+        if shard_jobs:
+            payloads.append(("pdfs", shard_jobs))
+    
+    ranked, counts, timings = _run_shards(payloads, query, keywords, top_k)
+    
+    # Same bookkeeping as run_batch(): per-page cost history and LPT estimate vs actual
+    page_counts = {(job["slot"], job["part"]): job["page_count"] for job in jobs}
+    predicted = Counter()
+    for job in jobs:
+        predicted[job["worker"]] += job["cost"]
+    spent = {}
+    for shard_timings in timings:
+        for slot, part, seconds in shard_timings:
+            done = spent.setdefault(os.path.basename(pdf_paths[slot]), [0.0, 0])
+            done[0] += seconds
+            done[1] += page_counts[(slot, part)]
+    if history_file:
+        for name, (seconds, pages) in spent.items():
+            if pages:
+                page_costs[name] = seconds / pages
+        save_page_costs(history_file, page_costs)
+    
+    actual = sorted((sum(seconds for _, _, seconds in shard_timings) for shard_timings in timings), reverse=True)
+    report = {
+        "workers": len(payloads),
+        "jobs": len(jobs),
+        "split_files": sum(1 for count in parts.values() if count > 1),
+        "failed": {},
+        "predicted_makespan": max(predicted.values()) if predicted else 0.0,
+        "actual_makespan": actual[0] if actual else 0.0,
+        "predicted_loads": sorted(predicted.values(), reverse=True),
+        "actual_loads": actual
+    }
+    return ranked, counts, report
+
+def _run_shards(payloads, query, keywords, top_k):
+    pipes = []
+    procs = []
+    try:
+        for payload in payloads:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_shard_worker, args=(child_conn, payload, query, keywords, top_k))
+            proc.start()
+            child_conn.close()
+            pipes.append(parent_conn)
+            procs.append(proc)
+        
+        # Map 1: workers load and filter their shard, reply with term statistics only
+        replies = [_receive(conn) for conn in pipes]
+        counts = {}
+        for _, _, shard_counts, _ in replies:
+            for slot, count in shard_counts.items():
+                counts[slot] = counts.get(slot, 0) + count
+        timings = [shard_timings for _, _, _, shard_timings in replies]
+        n_candidates = sum(n for _, n, _, _ in replies)
+        if not n_candidates:
+            for conn in pipes:
+                conn.send(None)
+            return [], counts, timings
+        
+        # Reduce: global vocabulary and IDF over every candidate
+        vocabulary, idf = _global_idf([stats for stats, _, _, _ in replies], n_candidates)
+        for conn in pipes:
+            conn.send((vocabulary, idf))
+        
+        # Map 2 results: each shard's top-k, merged k-way
+        merged = heapq.merge(*[_receive(conn) for conn in pipes])
+        return [section for _, _, section in itertools.islice(merged, top_k)], counts, timings
+    finally:
+        for conn in pipes:
+            conn.close()
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+def _receive(conn):
+    try:
+        message = conn.recv()
+    except EOFError:
+        raise RuntimeError("ranking shard worker exited unexpectedly")
+    if isinstance(message, Exception):
+        raise message
+    return message
+
+def _shard_worker(conn, payload, query, keywords, top_k):
+    try:
+        kind, items = payload
+        counts = {}
+        timings = []
+        if kind == "pdfs":
+            loaded = []
+            for slot, part, path, pages in items:
+                start = time.time()
+                sections = extract_premium_sections(path, pages)
+                timings.append((slot, part, time.time() - start))
+                counts[slot] = counts.get(slot, 0) + len(sections)
+                # (file slot, page-range part, position) orders like the flat list of the single-process path
+                loaded.extend(((slot, part, i), section) for i, section in enumerate(sections))
+            items = loaded
+        
+        candidates, stats = _score_shard(items, query, keywords)
+        conn.send((stats, len(candidates), counts, timings))
+        
+        weights = conn.recv()
+        if weights is not None:
+            conn.send(_rank_shard(candidates, query, *weights, top_k))
+    except Exception as e:
+        conn.send(RuntimeError(f"ranking shard failed: {type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def _score_shard(items, query, keywords):
+    candidates = []
+    for index, section in items:
+        section["relevance_score"] = calculate_optimal_score(section, query, keywords)
+        if section["relevance_score"] > 0.2:
+            candidates.append((index, section))
+    
+    # Compact statistics: sorted term array plus parallel term/document frequency arrays
+    stats = None
+    if candidates:
+        try:
+            counter = CountVectorizer(stop_words='english', ngram_range=(1, 2))
+            counts = counter.fit_transform([f"{s['section_title']} {s['section_content']}" for _, s in candidates]).tocsc()
+            stats = (
+                counter.get_feature_names_out(),
+                np.asarray(counts.sum(axis=0)).ravel().astype(np.int64),
+                np.diff(counts.indptr).astype(np.int64)
+            )
+        except ValueError:  # nothing but stop words
+            pass
+    return candidates, stats
+
+def _global_idf(shard_stats, n_candidates):
+    shard_stats = [stats for stats in shard_stats if stats is not None]
+    if not shard_stats:
+        return {}, np.empty(0)
+    
+    terms, inverse = np.unique(np.concatenate([stats[0] for stats in shard_stats]), return_inverse=True)
+    tfs = np.bincount(inverse, weights=np.concatenate([stats[1] for stats in shard_stats])).astype(np.int64)
+    dfs = np.bincount(inverse, weights=np.concatenate([stats[2] for stats in shard_stats]))
+    
+    # Same feature selection as TfidfVectorizer(max_features=...) on the full list
+    if len(terms) > TFIDF_MAX_FEATURES:
+        keep = np.sort((-tfs).argsort()[:TFIDF_MAX_FEATURES])
+        terms, dfs = terms[keep], dfs[keep]
+    
+    # Smoothed IDF, as TfidfTransformer computes it
+    dfs = dfs + 1.0
+    idf = np.log(np.full_like(dfs, n_candidates + 1) / dfs) + 1.0
+    return {term: i for i, term in enumerate(terms)}, idf
+
+def _rank_shard(candidates, query, vocabulary, idf, top_k):
+    try:
+        if not vocabulary:
+            raise ValueError("empty vocabulary")
+        counter = CountVectorizer(stop_words='english', ngram_range=(1, 2), vocabulary=vocabulary)
+        
+        def tfidf(texts):
+            matrix = counter.transform(texts).astype(np.float64)
+            matrix.data *= idf[matrix.indices]
+            return normalize(matrix)
+        
+        texts = [f"{s['section_title']} {s['section_content']}" for _, s in candidates]
+        tfidf_scores = cosine_similarity(tfidf([query]), tfidf(texts))[0]
+        
+        for i, (_, section) in enumerate(candidates):
+            section["final_score"] = section["relevance_score"] * 0.7 + tfidf_scores[i] * 0.3
+    
+    except ValueError:
+        for _, section in candidates:
+            section["final_score"] = section["relevance_score"]
+    
+    # Global index breaks ties, matching the stable sort of the single-process path
+    return heapq.nsmallest(top_k, ((-s["final_score"], index, s) for index, s in candidates))
+
 def extract_best_content(content, title, query_terms):
     """Extract the best content for subsection analysis"""
     content = optimal_ocr_clean(content)
@@ -443,46 +461,56 @@ def extract_best_content(content, title, query_terms):
     
     return best_sentence
 
-def main():
-    """Optimized main function for maximum accuracy in minimum time"""
-    start_time = time.time()
-    
-    print(f"🚀 OPTIMAL PROCESSING: {persona}")
-    print(f"🎯 Task: {job}")
+def analyze_persona(persona, job, documents, pdf_paths):
+    """Run keyword extraction, section ranking and content refinement over a corpus"""
+    persona_job_text = f"{persona}. {job}"
     
     # Extract keywords
     keywords = smart_keyword_extraction(persona, job, documents)
     print(f"🔑 {len(keywords)} keywords extracted")
     
-    # Process all PDFs
-    all_sections = []
-    input_pdfs = []
-    
-    for fname in sorted(os.listdir(INPUT_DIR)):
-        if fname.lower().endswith('.pdf'):
-            input_pdfs.append(fname)
-            print(f"📄 {fname}")
-            sections = extract_premium_sections(os.path.join(INPUT_DIR, fname))
+    if RANK_SHARDS > 1:
+        # Shard workers extract and score their own PDFs (big files split into page ranges);
+        # only term statistics, timings and top-k come back
+        ranked, counts, report = rank_documents_sharded(
+            pdf_paths, persona_job_text, keywords, shards=RANK_SHARDS, workers=WORKERS,
+            history_file=PAGE_COST_HISTORY
+        )
+        for slot, pdf_path in enumerate(pdf_paths):
+            print(f"📄 {os.path.basename(pdf_path)}")
+            print(f"   ✓ {counts.get(slot, 0)} sections")
+        
+        if report:
+            print_report(report)
+        print(f"\n📊 Total: {sum(counts.values())} sections from {len(pdf_paths)} files")
+    else:
+        # Process all PDFs (largest first, big files split across workers)
+        all_sections = []
+        results, report = run_batch(
+            pdf_paths, extract_premium_sections, workers=WORKERS, history_file=PAGE_COST_HISTORY,
+            split=True, merge=lambda parts: [section for part in parts for section in part]
+        )
+        
+        for pdf_path, sections in zip(pdf_paths, results):
+            sections = sections or []
+            print(f"📄 {os.path.basename(pdf_path)}")
             all_sections.extend(sections)
             print(f"   ✓ {len(sections)} sections")
+        
+        print_report(report)
+        print(f"\n📊 Total: {len(all_sections)} sections from {len(pdf_paths)} files")
+        
+        # Rank sections
+        ranked = rank_sections_optimally(all_sections, persona_job_text, keywords)
     
-    print(f"\n📊 Total: {len(all_sections)} sections from {len(input_pdfs)} files")
-    
-    # Rank sections
-    ranked = rank_sections_optimally(all_sections, persona_job_text, keywords)
-    
-    if not ranked:
-        print("❌ No relevant sections found")
-        return
-    
-    print(f"🏆 Top {len(ranked)} relevant sections ranked")
-    
-    # Create final output
-    top_5 = ranked[:5]
     extracted_sections = []
     subsection_analysis = []
     
-    for i, section in enumerate(top_5):
+    if ranked:
+        print(f"🏆 Top {len(ranked)} relevant sections ranked")
+    
+    # Create final output
+    for i, section in enumerate(ranked[:5]):
         refined_text = extract_best_content(section["section_content"], section["section_title"], persona_job_text)
         
         extracted_sections.append({
@@ -498,6 +526,51 @@ def main():
             "page_number": section["page"]
         })
     
+    return {
+        "extracted_sections": extracted_sections,
+        "subsection_analysis": subsection_analysis
+    }
+
+def cached_analysis(persona, job, documents, pdf_paths):
+    """analyze_persona() behind the result cache, keyed by corpus version and normalized query.
+    
+    The CLI answers one query per process, so only RESULT_CACHE_DIR gives it hits;
+    the in-memory LRU serves callers that import this module and query repeatedly.
+    """
+    # Analyze exactly the text the key is built from, so one key can only ever mean one result
+    persona, job = normalize_text(persona), normalize_text(job)
+    doc_names = sorted(normalize_text(doc.get('filename', '')) for doc in documents if isinstance(doc, dict))
+    key = make_key(
+        RESULT_SCHEMA_VERSION, TFIDF_MAX_FEATURES, corpus_version(pdf_paths),
+        persona, job, doc_names
+    )
+    
+    result = RESULT_CACHE.get(key)
+    if result is None:
+        result = analyze_persona(persona, job, documents, pdf_paths)
+        RESULT_CACHE.put(key, result)
+    else:
+        print("⚡ Served from result cache")
+    return result
+
+def main():
+    """Optimized main function for maximum accuracy in minimum time"""
+    start_time = time.time()
+    
+    print(f"🚀 OPTIMAL PROCESSING: {persona}")
+    print(f"🎯 Task: {job}")
+    
+    input_pdfs = [fname for fname in sorted(os.listdir(INPUT_DIR)) if fname.lower().endswith('.pdf')]
+    pdf_paths = [os.path.join(INPUT_DIR, fname) for fname in input_pdfs]
+    
+    analysis = cached_analysis(persona, job, documents, pdf_paths)
+    extracted_sections = analysis["extracted_sections"]
+    subsection_analysis = analysis["subsection_analysis"]
+    
+    if not extracted_sections:
+        print("❌ No relevant sections found")
+        return
+    
     # Save results
     result = {
         "metadata": {
@@ -518,6 +591,8 @@ def main():
     
     print(f"\n✅ PROCESSING COMPLETE in {elapsed:.2f}s")
     print(f"📁 Output: {os.path.join(OUTPUT_DIR, OUTPUT_FILE)}")
+    stats = RESULT_CACHE.stats()
+    print(f"🗄️  Result cache: {stats['hits']} hits ({stats['disk_hits']} from disk), {stats['misses']} misses")
     
     # Validation
     print(f"\n🎯 RESULTS VALIDATION:")
@@ -0,0 +1,94 @@
+"""Equivalence check: sharded 1b ranking must match the single-process ranking.
+
+    python benchmarks/rank_equivalence.py --shards 2 3 4 7 --synthetic 3000
+"""
+import os
+import sys
+import copy
+import math
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHALLENGE_1B = os.path.join(ROOT, "Challenge_1b")
+
+# process.py reads persona.json and input/ relative to its own directory
+os.chdir(CHALLENGE_1B)
+sys.path.insert(0, CHALLENGE_1B)
+import process  # noqa: E402
+
+
+def signature(ranked):
+    return [(s["document"], s["page"], s["section_title"], s["section_content"]) for s in ranked]
+
+
+def matches(ranked, baseline):
+    """Same sections in the same order; scores may differ only by float summation order"""
+    return signature(ranked) == signature(baseline) and all(
+        math.isclose(a["final_score"], b["final_score"], rel_tol=0, abs_tol=1e-12)
+        for a, b in zip(ranked, baseline)
+    )
+
+
+def synthetic_corpus(sections, count, seed=0):
+    """Shuffle words of the bundled sections into `count` new sections"""
+    rng = random.Random(seed)
+    words = " ".join(s["section_content"] for s in sections).split()
+    titles = [s["section_title"] for s in sections]
+    return [{
+        "document": f"synthetic-{i % 50:02d}.pdf",
+        "page": i % 40 + 1,
+        "section_title": rng.choice(titles),
+        "section_content": " ".join(rng.choices(words, k=rng.randint(40, 300)))
+    } for i in range(count)]
+
+
+def compare(label, sections, query, keywords, shard_counts):
+    baseline = process.rank_sections_optimally(copy.deepcopy(sections), query, keywords)
+    ok = True
+    for shards in shard_counts:
+        start = time.time()
+        ranked = process.rank_sections_sharded(copy.deepcopy(sections), query, keywords, shards=shards, workers=shards)
+        same = matches(ranked, baseline)
+        ok &= same
+        print(f"   {label}: {shards:3d} shards  {'✅ match' if same else '❌ MISMATCH'}  ({time.time() - start:.2f}s)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, nargs="+", default=[2, 3, 4, 7])
+    parser.add_argument("--synthetic", type=int, default=3000, help="size of the synthetic corpus (0 to skip)")
+    args = parser.parse_args()
+
+    pdf_paths = [os.path.join(process.INPUT_DIR, f) for f in sorted(os.listdir(process.INPUT_DIR)) if f.lower().endswith(".pdf")]
+    sections = [s for path in pdf_paths for s in process.extract_premium_sections(path)]
+    query = process.persona_job_text
+    keywords = process.smart_keyword_extraction(process.persona, process.job, process.documents)
+
+    print(f"📊 {len(sections)} bundled sections")
+    ok = compare("bundled", sections, query, keywords, args.shards)
+
+    # Workers that extract their own PDFs must agree too
+    baseline = process.rank_sections_optimally(copy.deepcopy(sections), query, keywords)
+    for shards in args.shards:
+        ranked, _, report = process.rank_documents_sharded(pdf_paths, query, keywords, shards=shards, workers=shards)
+        same = matches(ranked, baseline)
+        ok &= same
+        print(f"   documents: {shards:3d} shards  {'✅ match' if same else '❌ MISMATCH'}"
+              f"  ({report['jobs']} jobs, {report['split_files']} split)")
+
+    if args.synthetic:
+        corpus = synthetic_corpus(sections, args.synthetic)
+        print(f"📊 {len(corpus)} synthetic sections")
+        ok &= compare("synthetic", corpus, query, keywords, args.shards)
+
+    if not ok:
+        print("❌ Sharded ranking differs from the single-process ranking")
+        sys.exit(1)
+    print("✅ Sharded ranking matches the single-process ranking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Soak test: run the layout engine, the 1A batch and the 1B section extractor over
+bundled and image-heavy PDFs, with and without MuPDF store management.
+
+Each workload runs twice in a fresh process: once managed (MUPDF_STORE_LIMIT_MB)
+and once with management disabled. It passes only if the managed run stays flat
+after warmup and peaks well below the unmanaged one, so a workload that never
+fills the store, or management that does nothing, fails.
+
+    python benchmarks/soak_rss.py --documents 300 --store-limit-mb 16 --tolerance-mb 16
+"""
+import os
+import sys
+import glob
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+import fitz  # noqa: E402
+from common.layout import analyze_document  # noqa: E402
+from common.resources import current_rss  # noqa: E402
+from common.scheduler import run_batch  # noqa: E402
+
+MB = 1024 * 1024
+WORKLOADS = {
+    "layout": "analyze_document() in-process",
+    "batch": "1A run.py outline batch",
+    "sections": "1B extract_premium_sections batch"
+}
+
+
+def make_image_pdfs(directory, count, pages, seed=0):
+    """Text plus one distinct 600x600 image per page: fills MuPDF's store fast"""
+    rng = random.Random(seed)
+    paths = []
+    for n in range(count):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Soak Image Report {n} Section {p}", fontsize=20)
+            page.insert_text((72, 110), "Body text for section extraction. " * 8, fontsize=10)
+            # Random rows repeated: small once deflated, still 1 MB per image once decoded
+            samples = rng.randbytes(600 * 3 * 8) * 75
+            pix = fitz.Pixmap(fitz.csRGB, 600, 600, samples, False)
+            page.insert_image(fitz.Rect(72, 150, 500, 580), pixmap=pix)
+        path = os.path.join(directory, f"soak-image-{n}.pdf")
+        doc.save(path, deflate=True)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def _outline_rss(pdf_path, pages):
+    import run  # Challenge_1a, on sys.path in the child
+    run.outline_job(pdf_path, pages)
+    return current_rss()
+
+
+def _sections_rss(pdf_path, pages):
+    import process  # Challenge_1b, on sys.path in the child
+    process.extract_premium_sections(pdf_path, pages)
+    return current_rss()
+
+
+def run_child(workload, pdf_paths, documents, workers):
+    """Runs in the subprocess: RSS after every document, in completion order"""
+    paths = [pdf_paths[i % len(pdf_paths)] for i in range(documents)]
+    samples = []
+
+    if workload == "layout":
+        for path in paths:
+            analyze_document(path)
+            samples.append(current_rss())
+        return samples
+
+    challenge = os.path.join(ROOT, "Challenge_1a" if workload == "batch" else "Challenge_1b")
+    sys.path.insert(0, challenge)
+    os.chdir(challenge)  # 1B reads persona.json from its own directory
+
+    def collect(slot, result, error):
+        if error:
+            raise RuntimeError(f"{os.path.basename(paths[slot])}: {error}")
+        samples.append(result)
+
+    if workload == "batch":
+        run_batch(paths, _outline_rss, workers=workers, on_result=collect)
+    else:
+        run_batch(paths, _sections_rss, workers=workers, split=True, merge=max, on_result=collect)
+    return samples
+
+
+def measure(workload, pdf_paths, args, managed):
+    env = dict(os.environ)
+    if managed:
+        env["MUPDF_STORE_LIMIT_MB"] = str(args.store_limit_mb)
+    else:
+        env["MUPDF_STORE_LIMIT_MB"] = "0"
+        env["MUPDF_SHRINK_EVERY"] = "0"
+
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", workload,
+        "--documents", str(args.documents), "--workers", str(args.workers), "--"
+    ] + pdf_paths
+    start = time.time()
+    proc = subprocess.run(command, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stdout + proc.stderr)
+        raise RuntimeError(f"{workload} soak run failed")
+
+    samples = json.loads(proc.stdout.strip().splitlines()[-1])
+    warmup = min(args.warmup, len(samples) - 1)
+    baseline = max(samples[:warmup]) if warmup else samples[0]
+    return {
+        "peak": max(samples) / MB,
+        "growth": max(0, max(samples[warmup:]) - baseline) / MB,
+        "seconds": time.time() - start
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=300, help="documents processed per run")
+    parser.add_argument("--warmup", type=int, default=60, help="documents processed before the RSS baseline")
+    parser.add_argument("--tolerance-mb", type=float, default=16.0,
+                        help="allowed RSS growth after warmup, and the minimum gap to the unmanaged peak")
+    parser.add_argument("--store-limit-mb", type=float, default=16.0, help="MUPDF_STORE_LIMIT_MB for the managed runs")
+    parser.add_argument("--image-pdfs", type=int, default=3, help="generated image-heavy PDFs added to the bundled ones")
+    parser.add_argument("--image-pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="pool processes for the batch workloads")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--child", choices=list(WORKLOADS), help=argparse.SUPPRESS)
+    parser.add_argument("pdfs", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.pdfs, args.documents, args.workers)))
+        return
+
+    bundled = sorted(glob.glob(os.path.join(ROOT, "Challenge_1*", "input", "*.pdf")))
+    if not bundled:
+        print("❌ No bundled PDFs found.")
+        sys.exit(1)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_paths = bundled + make_image_pdfs(tmp, args.image_pdfs, args.image_pages)
+        print(f"📄 {len(bundled)} bundled + {args.image_pdfs} image-heavy PDFs, "
+              f"{args.documents} documents per run, store limit {args.store_limit_mb:g} MB")
+
+        for workload in args.workloads:
+            managed = measure(workload, pdf_paths, args, managed=True)
+            unmanaged = measure(workload, pdf_paths, args, managed=False)
+            gap = unmanaged["peak"] - managed["peak"]
+
+            print(f"\n🔁 {workload}: {WORKLOADS[workload]}")
+            for label, run in (("managed", managed), ("unmanaged", unmanaged)):
+                print(f"   {label:9s}  peak RSS {run['peak']:7.1f} MB  growth {run['growth']:5.1f} MB  ({run['seconds']:.1f}s)")
+
+            if managed["growth"] > args.tolerance_mb:
+                print(f"   ❌ RSS grew by more than {args.tolerance_mb:g} MB after warmup")
+                ok = False
+            elif gap < args.tolerance_mb:
+                print(f"   ❌ Managed peak is only {gap:.1f} MB below unmanaged: store management had no measurable effect")
+                ok = False
+            else:
+                print(f"   ✅ RSS stayed flat, {gap:.1f} MB below the unmanaged run")
+
+    if not ok:
+        sys.exit(1)
+    print("\n✅ Store management keeps RSS flat and bounded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from .layout import analyze_document, is_quality_title, optimal_ocr_clean, shared_analysis
+
+__all__ = ["analyze_document", "is_quality_title", "optimal_ocr_clean", "shared_analysis"]
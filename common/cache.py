@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+SPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Case- and whitespace-insensitive form of a persona or job string"""
+    return SPACE_PATTERN.sub(' ', text or '').strip().lower()
+
+
+def corpus_version(pdf_paths):
+    """Fingerprint a corpus from file names, sizes and modification times"""
+    digest = hashlib.sha256()
+    for path in sorted(pdf_paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """Fingerprint one file by content, so copies in different input folders match"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """Stable cache key from JSON-serialisable parts"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """In-memory LRU of JSON-serialisable results with an optional on-disk tier.
+
+    Entries older than `ttl` seconds are treated as misses. The memory tier holds
+    at most `max_entries` results; the disk tier (one JSON file per key in
+    `disk_dir`) is trimmed oldest-first to `max_disk_entries`.
+    """
+
+    def __init__(self, max_entries=128, ttl=None, disk_dir=None, max_disk_entries=1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return entry[1]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+            self._write_disk(key, entry)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._memory)
+        }
+
+    def _fresh(self, stored_at):
+        return self.ttl is None or time.time() - stored_at <= self.ttl
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except OSError:
+            return None
+        except ValueError:
+            stored = None
+
+        try:
+            stored_at, value = stored["stored_at"], stored["value"]
+            usable = isinstance(stored_at, (int, float)) and self._fresh(stored_at)
+        except (KeyError, TypeError):
+            # Corrupt or foreign file: drop it and treat as a miss
+            usable = False
+        if not usable:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored_at, value
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": entry[0], "value": entry[1]}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = []
+        try:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".json"):
+                    files.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            return
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,405 @@
+import os
+import re
+import fitz  # PyMuPDF
+
+from .cache import ResultCache, file_digest, make_key
+from .resources import release_document, trim_store
+
+# Point 1A and 1B at the same directory and each PDF is laid out once for both
+LAYOUT_CACHE_DIR = os.environ.get("LAYOUT_CACHE_DIR")
+# Bump whenever title, outline or section extraction changes so stored layouts are not reused
+LAYOUT_VERSION = 1
+# Disk only: within one run every file is analyzed once, so a memory tier would just hold sections
+LAYOUT_CACHE = ResultCache(max_entries=0, disk_dir=LAYOUT_CACHE_DIR) if LAYOUT_CACHE_DIR else None
+
+# Pre-compiled OCR fixes for maximum speed and accuracy
+OCR_FIXES = {
+    # Exact matches from actual errors
+    'savethe': 'save the', 'fromthe': 'from the', 'hamburgermenu': 'hamburger menu',
+    'renamethefile': 'rename the file', 'changeaflat': 'change a flat', 'formtoa': 'form to a',
+    'usingthe': 'using the', 'enablingthe': 'enabling the', 'FillinPDF': 'Fill in PDF',
+    'Istheform': 'Is the form', 'doesnotin': 'does not in', 'availablefrom': 'available from',
+    'Fromthetop': 'From the top', 'Createa': 'Create a', 'andthen': 'and then',
+    'selectthefile': 'select the file', 'tothe': 'to the', 'inthe': 'in the',
+    'ofthe': 'of the', 'onthe': 'on the', 'forthe': 'for the', 'withthe': 'with the',
+    'youcan': 'you can', 'itcan': 'it can', 'SaveAs': 'Save As', 'SaveAsin': 'Save As in',
+    'AdobeIn': 'Adobe In', 'AdobePDF': 'Adobe PDF', 'Fill&Sign': 'Fill & Sign',
+    'FillSign': 'Fill & Sign', 'PDFMaker': 'PDF Maker', 'PrepareForm': 'Prepare Form',
+    'SaveACopy': 'Save A Copy', 'thefile': 'the file', 'theform': 'the form',
+    'thetool': 'the tool', 'thefield': 'the field', 'thebutton': 'the button',
+    'youhave': 'you have', 'youare': 'you are', 'youwill': 'you will', 'youwant': 'you want',
+    'itis': 'it is', 'itwill': 'it will', 'ithas': 'it has', 'itdoes': 'it does',
+    'tosave': 'to save', 'tocreate': 'to create', 'tochange': 'to change', 'tofill': 'to fill',
+    'forsave': 'for save', 'forcreate': 'for create', 'witha': 'with a', 'withan': 'with an',
+    'asa': 'as a', 'asan': 'as an', 'ora': 'or a', 'oran': 'or an',
+
+    # Contractions
+    'dont': "don't", 'cant': "can't", 'wont': "won't", 'doesnt': "doesn't",
+    'isnt': "isn't", 'arent': "aren't", 'wasnt': "wasn't", 'werent': "weren't",
+    'hasnt': "hasn't", 'havent': "haven't", 'wouldnt': "wouldn't", 'shouldnt': "shouldn't",
+    'couldnt': "couldn't", 'mustnt': "mustn't", 'mightnt': "mightn't",
+
+    # Product names
+    'AdobeAcrobat': 'Adobe Acrobat', 'AdobeReader': 'Adobe Reader', 'MicrosoftOffice': 'Microsoft Office',
+    'MicrosoftWord': 'Microsoft Word', 'AdobePhotoshop': 'Adobe Photoshop',
+    'AdobeIllustrator': 'Adobe Illustrator', 'AdobeInDesign': 'Adobe InDesign',
+}
+
+# Pre-compiled regex patterns for speed
+SPACE_PATTERN = re.compile(r'\s+')
+ACRONYM_PATTERN = re.compile(r'\b([A-Z])\s+([A-Z])\s+([A-Z])\b')
+NUMBERED_HEADING_PATTERN = re.compile(r"^(\d+(?:\.\d+)*)(?:\.)?\s+(.+)")
+
+
+def optimal_ocr_clean(text):
+    """Optimal OCR cleaning - fast and comprehensive"""
+    if not text:
+        return ""
+
+    # Normalize whitespace first
+    text = SPACE_PATTERN.sub(' ', text).strip()
+
+    # Apply exact fixes (fastest method)
+    for bad, good in OCR_FIXES.items():
+        if bad in text:
+            text = text.replace(bad, good)
+
+    # Fix spaced acronyms
+    text = ACRONYM_PATTERN.sub(r'\1\2\3', text)
+
+    # Fix common spacing patterns (minimal regex for speed)
+    text = re.sub(r'\b([a-z]+)([A-Z][a-z]+)\b', r'\1 \2', text)  # wordWord -> word Word
+
+    return text.strip()
+
+
+def is_quality_title(text):
+    """Determine if text is a high-quality section title"""
+    if not text or len(text) < 5 or len(text) > 120:
+        return False
+
+    words = text.split()
+    if len(words) > 15:
+        return False
+
+    # Reject obvious content patterns
+    reject_patterns = [
+        'to save the completed', 'choose save as from', 'and rename the file',
+        'you can change a', 'by either using', 'for microsoft office',
+        'from the top toolbar', 'select create a pdf'
+    ]
+
+    if any(pattern in text.lower() for pattern in reject_patterns):
+        return False
+
+    # Prefer questions
+    if text.endswith('?'):
+        return True
+
+    # Prefer action-based titles
+    action_words = ['create', 'change', 'fill', 'sign', 'convert', 'edit', 'save', 'export', 'request', 'send']
+    if any(word in text.lower() for word in action_words):
+        return True
+
+    # Prefer title case without ending period
+    if text.istitle() and not text.endswith('.'):
+        return True
+
+    # Reject fragments ending with prepositions
+    if text.lower().endswith((' the', ' a', ' an', ' and', ' or', ' of', ' in', ' on', ' at', ' to', ' for')):
+        return False
+
+    return True
+
+
+def analyze_document(pdf_path, outline=True, sections=True, pages=None):
+    """Lay out every page once and derive title, outline and section chunks from it.
+
+    Returns a dict with "title", "outline" (1a format) and "sections" (1b format);
+    the parts that were not requested are left empty. `pages` limits the walk to a
+    (start, stop) range so a split document's sections can be extracted piecewise.
+    """
+    filename = os.path.basename(pdf_path)
+    result = {"title": "", "outline": [], "sections": []}
+
+    try:
+        with fitz.open(pdf_path) as doc:
+            toc = doc.get_toc() if outline else []
+            walk_outline = outline and not toc
+            raw_outline = []
+            is_form = False
+
+            start, stop = pages if pages else (0, len(doc))
+            for page_num in range(start, min(stop, len(doc))):
+                if page_num > start and not walk_outline and not sections:
+                    break
+
+                page = doc[page_num]
+                textpage = None
+                try:
+                    # One layout pass per page, serialised as both dict and plain text
+                    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT)
+                    blocks = page.get_text("dict", textpage=textpage)["blocks"]
+
+                    if outline and page_num == 0:
+                        result["title"] = _guess_title(blocks)
+                        heading = result["title"].lower()
+                        is_form = "application form" in heading or "form" in heading
+
+                    if walk_outline:
+                        raw_outline.extend(_outline_entries(blocks, page_num, result["title"], is_form))
+
+                    if sections:
+                        text = page.get_text("text", textpage=textpage)
+                        result["sections"].extend(_page_sections(blocks, text, page_num + 1, filename))
+                except Exception:
+                    # A broken page only costs its own sections; anything asking for the outline fails loudly
+                    if outline:
+                        raise
+                finally:
+                    # Drop the page's layout before the next one is built, and keep the
+                    # store under its cap while a large document is still open
+                    blocks = text = textpage = page = None
+                    trim_store()
+    finally:
+        release_document()
+
+    if outline:
+        result["outline"] = _clean_outline(toc or raw_outline, result["title"])
+
+    return result
+
+
+def shared_analysis(pdf_path, pages=None):
+    """Full analyze_document() result shared between 1A and 1B through LAYOUT_CACHE_DIR.
+
+    The first caller to see a file lays it out once (title, outline and sections)
+    and stores the result; later callers, in either CLI, read it back. A `pages`
+    range is sliced out of a stored result but never laid out here, since that
+    would analyze the whole file for one part. Returns None when there is nothing
+    to share, so the caller falls back to its own analyze_document() call.
+    """
+    if LAYOUT_CACHE is None:
+        return None
+
+    key = make_key(LAYOUT_VERSION, file_digest(pdf_path))
+    result = LAYOUT_CACHE.get(key)
+    if result is None:
+        if pages is not None:
+            return None
+        result = analyze_document(pdf_path)
+        LAYOUT_CACHE.put(key, result)
+
+    if pages is not None:
+        start, stop = pages
+        result = dict(result, sections=[s for s in result["sections"] if start < s["page"] <= stop])
+    return result
+
+
+def _guess_title(blocks):
+    spans = []
+    for b in blocks:
+        if "lines" in b:
+            for l in b["lines"]:
+                for s in l["spans"]:
+                    text = s["text"].strip()
+                    if len(text) > 5:
+                        spans.append({"size": s["size"], "text": text})
+
+    spans.sort(key=lambda x: -x["size"])
+    if not spans:
+        return ""
+
+    top_size = spans[0]["size"]
+    top_spans = [s["text"] for s in spans if s["size"] >= 0.9 * top_size]
+
+    title = " ".join(top_spans).strip()
+
+    # 🗑️ If the title is only dashes or equals, discard
+    if re.fullmatch(r"[-=]{3,}", title):
+        return ""
+
+    return title
+
+
+def _outline_entries(blocks, page_num, heading, is_form):
+    entries = []
+
+    for b in blocks:
+        spans = []
+        max_size = 0
+        top_y = 1000
+
+        for l in b.get("lines", []):
+            for s in l.get("spans", []):
+                text = s["text"].strip()
+                if text:
+                    spans.append(s)
+                    if s["size"] > max_size:
+                        max_size = s["size"]
+                    if s["bbox"][1] < top_y:
+                        top_y = s["bbox"][1]
+
+        line_text = " ".join(s["text"].strip() for s in spans).strip()
+        if not line_text:
+            continue
+
+        # ✅ Final skip: if exactly same as title, skip
+        if line_text.lower() == heading.lower():
+            continue
+
+        if len(line_text.split()) > 30:
+            continue
+
+        m = NUMBERED_HEADING_PATTERN.match(line_text)
+        if m:
+            numbering = m.group(1)
+            body = m.group(2).strip()
+
+            if is_form and numbering.isdigit():
+                continue
+
+            if page_num == 0 and numbering.isdigit() and len(body.split()) < 8:
+                continue
+
+            if re.search(r"\s+\d+$", body) and page_num <= 3:
+                continue
+
+            if numbering.count('.') == 0:
+                entries.append([1, line_text, page_num])
+            elif numbering.count('.') == 1:
+                entries.append([2, line_text, page_num])
+            else:
+                entries.append([3, line_text, page_num])
+            continue
+
+        if line_text.isupper() and len(line_text.split()) < 8:
+            entries.append([1, line_text, page_num])
+            continue
+
+        if (
+            len(line_text.split()) <= 6 and
+            line_text[0].isupper() and
+            max_size >= 10 and
+            top_y < 200
+        ):
+            entries.append([1, line_text, page_num])
+
+    return entries
+
+
+def _clean_outline(outline, heading):
+    cleaned = []
+    seen = set()
+    for item in outline:
+        level = f"H{item[0]}"
+        text = item[1].strip()
+        page = item[2]
+
+        # ✅ Final filter: remove any entry that matches title
+        if text.lower() == heading.lower():
+            continue
+
+        key = (level, text, page)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        cleaned.append({
+            "level": level,
+            "text": text,
+            "page": page
+        })
+
+    return cleaned
+
+
+def _page_sections(blocks, text, page_num, filename):
+    if not text or len(text) < 100:
+        return []
+
+    try:
+        # Clean text once
+        clean_text = optimal_ocr_clean(text)
+
+        # Try font-based extraction first (most accurate)
+        font_sections = _font_sections(blocks, page_num, filename)
+        if font_sections:
+            return font_sections
+
+        # Fallback to pattern-based extraction
+        return _pattern_sections(clean_text, page_num, filename)
+    except Exception:
+        return []
+
+
+def _font_sections(blocks, page_num, filename):
+    """Font-based extraction for structured documents"""
+    try:
+        text_elements = []
+        for block in blocks:
+            if "lines" in block:
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        if span["text"].strip():
+                            text_elements.append({
+                                'text': optimal_ocr_clean(span["text"].strip()),
+                                'size': span["size"],
+                                'flags': span["flags"]
+                            })
+
+        if not text_elements:
+            return []
+
+        # Find headers by font size
+        avg_size = sum(elem['size'] for elem in text_elements) / len(text_elements)
+        threshold = avg_size * 1.1
+
+        chunks = []
+        for elem in text_elements:
+            text = elem['text']
+            is_header = (
+                (elem['size'] > threshold or elem['flags'] & 16) and  # Larger or bold
+                is_quality_title(text)
+            )
+            chunks.append((is_header, text))
+
+        return _collect_sections(chunks, page_num, filename)
+    except Exception:
+        return []
+
+
+def _pattern_sections(text, page_num, filename):
+    """Pattern-based extraction as fallback"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    return _collect_sections(((is_quality_title(line), line) for line in lines), page_num, filename)
+
+
+def _collect_sections(chunks, page_num, filename):
+    sections = []
+    current_title = None
+    current_content = []
+
+    def flush():
+        if current_title and current_content:
+            content = ' '.join(current_content)
+            if len(content) > 80:
+                sections.append({
+                    "document": filename,
+                    "page": page_num,
+                    "section_title": current_title,
+                    "section_content": content
+                })
+
+    for is_header, text in chunks:
+        if is_header:
+            # Save previous section
+            flush()
+            current_title = text
+            current_content = []
+        else:
+            current_content.append(text)
+
+    # Add final section
+    flush()
+    return sections
@@ -0,0 +1,78 @@
+import os
+import math
+import fitz  # PyMuPDF
+
+# Cap on MuPDF's global object store (fonts, images, parsed objects); 0 disables
+STORE_LIMIT = int(float(os.environ.get("MUPDF_STORE_LIMIT_MB", 64)) * 1024 * 1024)
+# Empty the store completely after this many analyzed documents (0 disables)
+SHRINK_EVERY = int(os.environ.get("MUPDF_SHRINK_EVERY", 100))
+# MuPDF's FZ_STORE_DEFAULT, the maximum PyMuPDF creates its context with
+DEFAULT_STORE_MAX = 256 << 20
+
+_documents_seen = 0
+
+
+def configure_store(limit_bytes=None, shrink_every=None):
+    """Override the store cap and the periodic full-shrink interval"""
+    global STORE_LIMIT, SHRINK_EVERY
+    if limit_bytes is not None:
+        STORE_LIMIT = int(limit_bytes)
+    if shrink_every is not None:
+        SHRINK_EVERY = int(shrink_every)
+
+
+def store_size():
+    """Current MuPDF store size in bytes, or None if this PyMuPDF cannot report it"""
+    # A property on older PyMuPDF, a plain function on newer releases (which return None)
+    size = fitz.TOOLS.store_size
+    return size() if callable(size) else size
+
+
+def store_maxsize():
+    """MuPDF store maximum in bytes (newer PyMuPDF cannot report it either)"""
+    size = fitz.TOOLS.store_maxsize
+    return (size() if callable(size) else size) or DEFAULT_STORE_MAX
+
+
+def trim_store():
+    """Shrink the MuPDF store back under STORE_LIMIT; returns bytes freed (0 if unknown)"""
+    if STORE_LIMIT <= 0:
+        return 0
+    size = store_size()
+    if size is None:
+        # Newer PyMuPDF cannot report the size, but its MuPDF shrinks the store to a
+        # percentage of the maximum rather than of the current size, so the cap is a
+        # fixed percentage and the call is a cheap no-op while the store is under it
+        keep = STORE_LIMIT * 100 // store_maxsize()
+        if keep < 100:
+            fitz.TOOLS.store_shrink(100 - keep)
+        return 0
+    if size <= STORE_LIMIT:
+        return 0
+    percent = min(100, math.ceil(100 * (size - STORE_LIMIT) / size))
+    fitz.TOOLS.store_shrink(percent)
+    return size - (store_size() or 0)
+
+
+def release_document():
+    """Call once an analyzed document is closed: enforce the cap, periodically empty the store.
+
+    Each call counts towards SHRINK_EVERY, so every page range of a split file counts
+    as one document; cheap opens such as the scheduler's page-count pre-scan do not call it.
+    """
+    global _documents_seen
+    _documents_seen += 1
+    if SHRINK_EVERY and _documents_seen % SHRINK_EVERY == 0:
+        fitz.TOOLS.store_shrink(100)
+    else:
+        trim_store()
+
+
+def current_rss():
+    """Resident set size of this process in bytes (Linux), else peak RSS"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
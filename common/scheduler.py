@@ -0,0 +1,204 @@
+import os
+import json
+import math
+import time
+import heapq
+import fitz  # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Seconds per page used when no cost history exists (measured on the bundled PDFs)
+DEFAULT_PAGE_COST = 0.005
+
+
+def page_count(pdf_path):
+    """Cheap pre-scan: opening a PDF reads its xref, not its page content.
+
+    Not counted by release_document(), so MUPDF_SHRINK_EVERY counts analyses only.
+    """
+    try:
+        with fitz.open(pdf_path) as doc:
+            return len(doc)
+    except Exception:
+        return 0
+
+
+def load_page_costs(history_file):
+    """Load historical seconds-per-page keyed by file name"""
+    if not history_file or not os.path.exists(history_file):
+        return {}
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_page_costs(history_file, costs):
+    if not history_file:
+        return
+    with open(history_file, "w", encoding="utf-8") as f:
+        json.dump(costs, f, indent=2, ensure_ascii=False)
+
+
+def plan_batch(pdf_paths, workers=1, page_costs=None, split=False):
+    """Order work largest-first and bin it onto workers to minimise makespan.
+
+    Each job is a dict with the file's output `slot` (its index in `pdf_paths`),
+    its `pages` range, predicted `cost` in seconds and the `worker` bin of the LPT
+    estimate. A process pool hands jobs to whichever process is free, so the bins
+    predict each worker's load rather than pin jobs to processes. With `split`,
+    files bigger than the ideal per-worker share are cut into page ranges.
+    """
+    page_costs = page_costs or {}
+    default_cost = (sum(page_costs.values()) / len(page_costs)) if page_costs else DEFAULT_PAGE_COST
+    workers = max(1, workers)
+
+    counts = [page_count(path) for path in pdf_paths]
+    chunk = max(1, math.ceil(sum(counts) / workers)) if split and workers > 1 else None
+
+    jobs = []
+    for slot, (path, count) in enumerate(zip(pdf_paths, counts)):
+        per_page = page_costs.get(os.path.basename(path), default_cost)
+        ranges = [(0, count)]
+        if chunk and count > chunk:
+            ranges = [(start, min(start + chunk, count)) for start in range(0, count, chunk)]
+        for part, (start, stop) in enumerate(ranges):
+            jobs.append({
+                "path": path,
+                "slot": slot,
+                "part": part,
+                "pages": (start, stop),
+                "page_count": stop - start,
+                # Every open costs something, even for an empty or unreadable file
+                "cost": max(stop - start, 1) * per_page
+            })
+
+    # Longest processing time first, each job onto the least-loaded worker
+    jobs.sort(key=lambda j: (-j["cost"], j["slot"], j["part"]))
+    loads = [(0.0, w) for w in range(workers)]
+    for job in jobs:
+        load, worker = heapq.heappop(loads)
+        job["worker"] = worker
+        heapq.heappush(loads, (load + job["cost"], worker))
+
+    return jobs
+
+
+def _timed(work_fn, path, pages):
+    start = time.time()
+    try:
+        result, error = work_fn(path, pages), None
+    except Exception as e:
+        # A bad file fails its own job, not the batch
+        result, error = None, f"{type(e).__name__}: {e}"
+    # The pid tells the report which worker process actually ran the job
+    return result, time.time() - start, error, os.getpid()
+
+
+def run_batch(pdf_paths, work_fn, workers=1, history_file=None, split=False, merge=None, on_result=None):
+    """Run `work_fn(path, pages)` over every PDF and return results in input order.
+
+    `pages` is None unless the file was split, in which case the parts are handed
+    to `merge` in page order to rebuild the file's result. A file whose job raised
+    gets None. `on_result(slot, result, error)` is called as soon as each file is
+    complete, so callers can write output without waiting for the whole batch.
+    Returns the results and a report with the LPT estimate and actual makespan,
+    plus predicted and actual busy seconds per worker (each sorted, largest first).
+    """
+    page_costs = load_page_costs(history_file)
+    jobs = plan_batch(pdf_paths, workers, page_costs, split)
+    parts = {}
+    for job in jobs:
+        parts[job["slot"]] = parts.get(job["slot"], 0) + 1
+
+    predicted = {}
+    for job in jobs:
+        predicted[job["worker"]] = predicted.get(job["worker"], 0.0) + job["cost"]
+
+    pieces = {}
+    spent = {}
+    busy = {}
+    results = [None] * len(pdf_paths)
+    failed = {}
+
+    def finish(job, outcome):
+        result, seconds, error, pid = outcome
+        slot = job["slot"]
+        if pid is not None:
+            busy[pid] = busy.get(pid, 0.0) + seconds
+        pieces.setdefault(slot, []).append((job["part"], result, error))
+        if error is None:
+            name = os.path.basename(job["path"])
+            done = spent.setdefault(name, [0.0, 0])
+            done[0] += seconds
+            done[1] += job["page_count"]
+        if len(pieces[slot]) < parts[slot]:
+            return
+
+        ordered = sorted(pieces[slot], key=lambda p: p[0])
+        errors = [error for _, _, error in ordered if error]
+        if errors:
+            failed[slot] = errors[0]
+        elif len(ordered) == 1:
+            results[slot] = ordered[0][1]
+        else:
+            outputs = [result for _, result, _ in ordered]
+            results[slot] = merge(outputs) if merge else outputs
+        if on_result:
+            on_result(slot, results[slot], failed.get(slot))
+
+    start = time.time()
+    try:
+        if workers <= 1:
+            for job in jobs:
+                finish(job, _timed(work_fn, job["path"], _job_pages(job, parts)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Submitted largest-first, so idle workers always pick up the biggest job left
+                futures = {
+                    pool.submit(_timed, work_fn, job["path"], _job_pages(job, parts)): job
+                    for job in jobs
+                }
+                for future in as_completed(futures):
+                    try:
+                        outcome = future.result()
+                    except Exception as e:  # worker died or the result would not pickle
+                        outcome = (None, 0.0, f"{type(e).__name__}: {e}", None)
+                    finish(futures[future], outcome)
+    finally:
+        if history_file:
+            for name, (seconds, pages) in spent.items():
+                if pages:
+                    page_costs[name] = seconds / pages
+            save_page_costs(history_file, page_costs)
+    elapsed = time.time() - start
+
+    report = {
+        "workers": max(1, workers),
+        "jobs": len(jobs),
+        "split_files": sum(1 for count in parts.values() if count > 1),
+        "failed": {os.path.basename(pdf_paths[slot]): error for slot, error in sorted(failed.items())},
+        "predicted_makespan": max(predicted.values()) if predicted else 0.0,
+        "actual_makespan": elapsed,
+        "predicted_loads": sorted(predicted.values(), reverse=True),
+        "actual_loads": sorted(busy.values(), reverse=True)
+    }
+    return results, report
+
+
+def _job_pages(job, parts):
+    return job["pages"] if parts[job["slot"]] > 1 else None
+
+
+def print_report(report):
+    print(f"⏱️  Scheduled {report['jobs']} jobs on {report['workers']} worker(s)"
+          f" ({report['split_files']} split)")
+    print(f"   LPT estimate {report['predicted_makespan']:.2f}s, actual {report['actual_makespan']:.2f}s")
+    print(f"   per-worker busy: estimate {_seconds(report['predicted_loads'])}, "
+          f"actual {_seconds(report['actual_loads'])}")
+    for name, error in report["failed"].items():
+        print(f"   ❌ {name}: {error}")
+
+
+def _seconds(loads):
+    return "[" + ", ".join(f"{load:.2f}s" for load in loads) + "]"